@@ -1,20 +1,51 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
+from flask.json.provider import JSONProvider
 from node import Node
 from typing import Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson"""
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = ORJSONProvider(app)
 node: Optional[Node] = None
 
+def _dumps(obj) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    import json
+    return json.dumps(obj)
+
 @app.route('/chain', methods=['GET'])
 def get_chain():
     global node
     if not node:
         return jsonify({'error': 'Node not initialized'}), 500
-    chain = [vars(block) for block in node.blockchain.chain]
-    return jsonify({
-        'chain': chain,
-        'length': len(chain)
-    })
+
+    chain = node.blockchain.chain
+
+    def generate():
+        # Stream one block at a time instead of materializing the whole
+        # chain in memory before responding
+        yield '{"chain": ['
+        for i, block in enumerate(chain):
+            if i:
+                yield ','
+            yield _dumps(block.to_dict())
+        yield '], "length": %d}' % len(chain)
+
+    return Response(generate(), mimetype='application/json')
 
 @app.route('/transaction/new', methods=['POST'])
 def new_transaction():
@@ -68,4 +99,10 @@ def start_api(node_instance: Node, port: int):
     if not node_instance:
         raise ValueError("Node instance cannot be None")
     node = node_instance
-    app.run(host='0.0.0.0', port=port, threaded=True)
+    try:
+        # Serve through waitress when installed: a production WSGI server
+        # with a worker pool instead of Flask's development server
+        from waitress import serve
+        serve(app, host='0.0.0.0', port=port)
+    except ImportError:
+        app.run(host='0.0.0.0', port=port, threaded=True)
@@ -1,28 +1,73 @@
+import os
 import time
-import json
+import struct
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import List, Dict
-from crypto import hash_block, verify_signature
+from crypto import hash_block, merkle_root, verify_signature, verify_signatures
+from mining import QuantumProofOfWork
 from transaction import Transaction
+from pow_native import find_nonce as native_find_nonce
+
+# Nonces scanned per native call when the search is spread across cores;
+# workers poll for a winner between chunks, so this bounds stop latency.
+_POW_CHUNK = 1 << 18
+
+# Chains shorter than this are validated serially; below it the process
+# pool startup costs more than the hashing it saves.
+_VALIDATE_PARALLEL_THRESHOLD = 256
+
+def _hash_header(header: bytes) -> str:
+    """
+    Hash a block's serialized header. Module-level so it can be shipped to
+    ProcessPoolExecutor workers during chain validation.
+    """
+    return hash_block(header)
 
 class Block:
-    def __init__(self, index: int, transactions: List[Transaction], 
+    def __init__(self, index: int, transactions: List[Transaction],
                  timestamp: float, previous_hash: str, nonce: int = 0):
         self.index = index
         self.transactions = transactions
         self.timestamp = timestamp
         self.previous_hash = previous_hash
         self.nonce = nonce
+        # Blocks are immutable once mined apart from the nonce, so the
+        # fixed binary header and transaction Merkle root are computed once
+        # and reused for every hash during mining and validation.
+        self._merkle_root = self._compute_merkle_root()
+        self._hash_prefix = (
+            struct.pack('<Qd', self.index, self.timestamp)
+            + self._previous_hash_bytes()
+            + self._merkle_root
+        )
         self.hash = self.calculate_hash()
 
+    def _previous_hash_bytes(self) -> bytes:
+        # Mined blocks carry a 128-character SHA3-512 hex digest; the
+        # genesis placeholder ("0") is folded in as raw text.
+        if len(self.previous_hash) == 128:
+            return bytes.fromhex(self.previous_hash)
+        return self.previous_hash.encode()
+
+    def _compute_merkle_root(self) -> bytes:
+        return merkle_root([t.to_canonical_bytes() for t in self.transactions])
+
     def calculate_hash(self) -> str:
-        block_string = json.dumps({
+        return hash_block(self._hash_prefix + struct.pack('<Q', self.nonce))
+
+    def to_dict(self) -> Dict:
+        """
+        Convert block to dictionary format
+        """
+        return {
             "index": self.index,
             "transactions": [t.to_dict() for t in self.transactions],
             "timestamp": self.timestamp,
             "previous_hash": self.previous_hash,
-            "nonce": self.nonce
-        }, sort_keys=True)
-        return hash_block(block_string)
+            "nonce": self.nonce,
+            "hash": self.hash
+        }
 
 class Blockchain:
     def __init__(self):
@@ -30,6 +75,9 @@ class Blockchain:
         self.difficulty = 4
         self.pending_transactions: List[Transaction] = []
         self.mining_reward = 50
+        # Running balance per address, updated as blocks are committed,
+        # so get_balance is a single dict lookup
+        self._balance_index: Dict[str, float] = {}
         self.create_genesis_block()
 
     def create_genesis_block(self):
@@ -50,39 +98,132 @@ class Blockchain:
                      time.time(), self.get_latest_block().hash)
         
         block.nonce = self.proof_of_work(block)
-        
+        block.hash = block.calculate_hash()
+
         self.chain.append(block)
+        self._index_transactions(block.transactions)
         self.pending_transactions = [
             Transaction("network", miner_address, self.mining_reward)
         ]
 
     def proof_of_work(self, block: Block) -> int:
-        block.nonce = 0
-        computed_hash = block.calculate_hash()
-        while not computed_hash.startswith('0' * self.difficulty):
-            block.nonce += 1
-            computed_hash = block.calculate_hash()
+        nonce = self._proof_of_work_native(block)
+        if nonce is not None:
+            block.nonce = nonce
+            return block.nonce
+
+        checker = QuantumProofOfWork(self.difficulty)
+        block.nonce = checker.find_nonce(block._hash_prefix)
         return block.nonce
 
+    def _proof_of_work_native(self, block: Block) -> int | None:
+        """
+        Run the nonce search in the native extension, hashing
+        prefix + str(nonce) + suffix entirely in C. Returns None when the
+        extension is unavailable so the caller can fall back to Python.
+        """
+        if native_find_nonce is None:
+            return None
+
+        workers = os.cpu_count() or 1
+        if workers == 1:
+            nonce = native_find_nonce(block._hash_prefix, b"", self.difficulty)
+            return nonce if nonce >= 0 else None
+
+        # Spread disjoint nonce chunks across cores: ctypes releases the
+        # GIL for the duration of each native call, so the threads scan
+        # in parallel. Any nonce that meets the target is a valid proof.
+        prefix = block._hash_prefix
+        lock = threading.Lock()
+        next_chunk = 0
+        found: List[int] = []
+
+        def scan():
+            nonlocal next_chunk
+            while not found:
+                with lock:
+                    start = next_chunk * _POW_CHUNK
+                    next_chunk += 1
+                nonce = native_find_nonce(prefix, b"", self.difficulty,
+                                          start, start + _POW_CHUNK)
+                if nonce >= 0:
+                    found.append(nonce)
+                    return
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for _ in range(workers):
+                executor.submit(scan)
+        return min(found) if found else None
+
     def is_chain_valid(self) -> bool:
+        recomputed = self._recompute_hashes()
         for i in range(1, len(self.chain)):
             current_block = self.chain[i]
             previous_block = self.chain[i-1]
 
-            if current_block.hash != current_block.calculate_hash():
+            if current_block.hash != recomputed[i - 1]:
                 return False
 
             if current_block.previous_hash != previous_block.hash:
                 return False
 
+            if not self._transactions_valid(current_block):
+                return False
+
+        return True
+
+    def _recompute_hashes(self) -> List[str]:
+        """
+        Recompute the hash of every non-genesis block. Each block hashes
+        independently, so long chains are fanned out over a process pool;
+        link and signature checks stay serial in the caller.
+        """
+        headers = [block._hash_prefix + struct.pack('<Q', block.nonce)
+                   for block in self.chain[1:]]
+        if len(headers) < _VALIDATE_PARALLEL_THRESHOLD:
+            return [hash_block(header) for header in headers]
+        with ProcessPoolExecutor() as executor:
+            return list(executor.map(_hash_header, headers, chunksize=64))
+
+    def _transactions_valid(self, block: Block) -> bool:
+        """
+        Verify a block's transaction signatures in batched passes, one per
+        signing address, instead of one verification call per transaction
+        """
+        unverified = [t for t in block.transactions if t.sender != "network"]
+        if not unverified:
+            return True
+        if any(not t.signature or t.public_key is None for t in unverified):
+            return False
+        # Every attached key must derive its transaction's sender address;
+        # within a sender the keys are then interchangeable for batching
+        if any(hash_block(str(t.public_key))[:40] != t.sender
+               for t in unverified):
+            return False
+
+        groups: Dict[str, List[Transaction]] = {}
+        for transaction in unverified:
+            groups.setdefault(transaction.sender, []).append(transaction)
+        for transactions in groups.values():
+            results = verify_signatures(
+                transactions[0].public_key,
+                [t.calculate_hash() for t in transactions],
+                [t.signature for t in transactions]
+            )
+            if not all(results):
+                return False
         return True
 
+    def _index_transactions(self, transactions: List[Transaction]):
+        """
+        Fold committed transactions into the per-address balance index
+        """
+        balances = self._balance_index
+        for transaction in transactions:
+            balances[transaction.sender] = \
+                balances.get(transaction.sender, 0.0) - transaction.amount
+            balances[transaction.recipient] = \
+                balances.get(transaction.recipient, 0.0) + transaction.amount
+
     def get_balance(self, address: str) -> float:
-        balance = 0
-        for block in self.chain:
-            for transaction in block.transactions:
-                if transaction.sender == address:
-                    balance -= transaction.amount
-                if transaction.recipient == address:
-                    balance += transaction.amount
-        return balance
+        return self._balance_index.get(address, 0.0)
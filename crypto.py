@@ -5,8 +5,14 @@ from cryptography.hazmat.primitives.asymmetric import padding, rsa
 from cryptography.exceptions import InvalidSignature
 import base64
 import secrets
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple, List, Dict
 from dataclasses import dataclass
+from pow_native import merkle_level as _native_merkle_level
+
+# Signatures hashed per worker chunk when batch-verifying; OpenSSL releases
+# the GIL inside each digest call, so chunks run on multiple cores.
+_BATCH_CHUNK = 1000
 
 class SPHINCSPlus:
     """
@@ -24,6 +30,11 @@ class SPHINCSPlus:
     def _generate_public_key(self) -> bytes:
         return hashlib.sha3_512(self.private_key).digest()
 
+    def __str__(self) -> str:
+        # Stable textual form of the public key, used to derive wallet
+        # addresses; must not depend on object identity
+        return self.public_key.hex()
+
     def sign(self, message: bytes) -> bytes:
         # Simulate SPHINCS+ signature
         h = hashlib.sha3_512()
@@ -38,6 +49,103 @@ class SPHINCSPlus:
         h.update(message)
         return h.digest() == signature
 
+    def verify_batch(self, messages: List[bytes],
+                     signatures: List[bytes]) -> List[bool]:
+        """
+        Verify many signatures in one pass: lay each key||message row out
+        contiguously, hash the rows across a thread pool, and compare all
+        digests against the signatures with a single vectorized comparison.
+        """
+        if not messages:
+            return []
+        rows = [self.private_key + m for m in messages]
+        chunks = [rows[i:i + _BATCH_CHUNK]
+                  for i in range(0, len(rows), _BATCH_CHUNK)]
+        if len(chunks) > 1:
+            digests: List[bytes] = []
+            with ThreadPoolExecutor() as executor:
+                for part in executor.map(
+                        lambda chunk: [hashlib.sha3_512(r).digest() for r in chunk],
+                        chunks):
+                    digests.extend(part)
+        else:
+            digests = [hashlib.sha3_512(r).digest() for r in rows]
+
+        results = [False] * len(messages)
+        regular = [i for i, s in enumerate(signatures) if len(s) == 64]
+        if regular:
+            expected = np.frombuffer(
+                b"".join(digests[i] for i in regular), dtype=np.uint8
+            ).reshape(-1, 64)
+            provided = np.frombuffer(
+                b"".join(signatures[i] for i in regular), dtype=np.uint8
+            ).reshape(-1, 64)
+            matches = np.all(expected == provided, axis=1)
+            for i, ok in zip(regular, matches):
+                results[i] = bool(ok)
+        return results
+
+# Number-theoretic transform parameters: a 32-bit NTT-friendly prime
+# (3 * 2^30 + 1) with primitive root 5. Products of two residues fit in
+# uint64, and the prime exceeds any convolution coefficient arising from
+# the NTRU moduli used below, so the transform is exact.
+_NTT_PRIME = 3221225473
+_NTT_ROOT = 5
+
+def _ntt(a: np.ndarray, invert: bool = False) -> np.ndarray:
+    """Iterative radix-2 NTT over Z_p with vectorized butterflies"""
+    n = len(a)
+    bits = n.bit_length() - 1
+    rev = np.zeros(n, dtype=np.int64)
+    for i in range(1, n):
+        rev[i] = (rev[i >> 1] >> 1) | ((i & 1) << (bits - 1))
+    a = a[rev].astype(np.uint64)
+
+    length = 2
+    while length <= n:
+        half = length // 2
+        w = pow(_NTT_ROOT, (_NTT_PRIME - 1) // length, _NTT_PRIME)
+        if invert:
+            w = pow(w, _NTT_PRIME - 2, _NTT_PRIME)
+        ws = np.empty(half, dtype=np.uint64)
+        cur = 1
+        for i in range(half):
+            ws[i] = cur
+            cur = cur * w % _NTT_PRIME
+        blocks = a.reshape(-1, length)
+        u = blocks[:, :half].copy()
+        v = (blocks[:, half:] * ws) % _NTT_PRIME
+        blocks[:, :half] = (u + v) % _NTT_PRIME
+        blocks[:, half:] = (u + _NTT_PRIME - v) % _NTT_PRIME
+        length *= 2
+
+    if invert:
+        n_inv = pow(n, _NTT_PRIME - 2, _NTT_PRIME)
+        a = (a * np.uint64(n_inv)) % _NTT_PRIME
+    return a
+
+def _cyclic_convolve(a: np.ndarray, b: np.ndarray, N: int, q: int) -> np.ndarray:
+    """
+    Multiply two polynomials in Z_q[x]/(x^N - 1) via the NTT: transform,
+    pointwise multiply, inverse transform, then fold the linear-convolution
+    tail back onto the low coefficients. O(N log N) instead of O(N^2).
+    """
+    size = 1 << (2 * N - 1).bit_length()
+    fa = np.zeros(size, dtype=np.uint64)
+    fb = np.zeros(size, dtype=np.uint64)
+    fa[:len(a)] = a
+    fb[:len(b)] = b
+    prod = (_ntt(fa) * _ntt(fb)) % _NTT_PRIME
+    res = _ntt(prod, invert=True)
+    out = res[:N].copy()
+    tail = res[N:2 * N - 1]
+    out[:len(tail)] = (out[:len(tail)] + tail) % _NTT_PRIME
+    if q & (q - 1) == 0:
+        # Power-of-two modulus reduces with a single vector AND instead of
+        # the much slower divmod kernel
+        return out & np.uint64(q - 1)
+    return out % np.uint64(q)
+
 class NTRUEncryption:
     """
     Simulated NTRU implementation
@@ -47,8 +155,13 @@ class NTRUEncryption:
         self.N = N
         self.p = p
         self.q = q
+        # Power-of-two q lets reductions modulo q use a bitwise AND
+        assert q & (q - 1) == 0, "q must be a power of two"
         self.private_key = None
         self.public_key = None
+        # Scratch polynomial reused across encrypt/decrypt calls so the
+        # hot path does not allocate per message
+        self._poly_buf = np.zeros(N, dtype=np.uint64)
         self._generate_keypair()
 
     def _generate_keypair(self):
@@ -57,22 +170,55 @@ class NTRUEncryption:
         self.public_key = np.random.randint(0, self.q, self.N)
 
     def encrypt(self, message: bytes) -> bytes:
-        # Simulate NTRU encryption
+        # NTRU encryption: convolve the message polynomial with the public
+        # key in Z_q[x]/(x^N - 1)
         msg_array = np.frombuffer(message, dtype=np.uint8)
-        encrypted = (msg_array * self.public_key[:len(msg_array)]) % self.q
-        return encrypted.tobytes()
+        m = self._poly_buf
+        m[:] = 0
+        m[:len(msg_array)] = msg_array
+        encrypted = _cyclic_convolve(m, self.public_key.astype(np.uint64),
+                                     self.N, self.q)
+        return encrypted.astype(np.uint16).tobytes()
 
     def decrypt(self, ciphertext: bytes) -> bytes:
-        # Simulate NTRU decryption
-        cipher_array = np.frombuffer(ciphertext, dtype=np.uint8)
-        decrypted = (cipher_array * self.private_key[:len(cipher_array)]) % self.p
-        return decrypted.tobytes()
-
-def hash_block(data: str) -> str:
+        # NTRU decryption: convolve the ciphertext polynomial with the
+        # private key, reducing modulo the small modulus p
+        cipher_array = np.frombuffer(ciphertext, dtype=np.uint16)
+        c = self._poly_buf
+        c[:] = 0
+        c[:len(cipher_array)] = cipher_array
+        decrypted = _cyclic_convolve(c, self.private_key.astype(np.uint64),
+                                     self.N, self.p)
+        return decrypted.astype(np.uint8).tobytes()
+
+def hash_block(data: str | bytes) -> str:
     """
     Quantum-resistant hashing function using SHA3-512
     """
-    return hashlib.sha3_512(data.encode()).hexdigest()
+    if isinstance(data, str):
+        data = data.encode()
+    return hashlib.sha3_512(data).hexdigest()
+
+def merkle_root(leaves: List[bytes]) -> bytes:
+    """
+    Fold serialized transactions pairwise into a SHA3-512 Merkle root.
+    Tree levels are hashed through the native two-lane kernel when the
+    extension is available, one sibling pair per lane.
+    """
+    level = [hashlib.sha3_512(leaf).digest() for leaf in leaves]
+    if not level:
+        return bytes(64)
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        pairs = len(level) // 2
+        if _native_merkle_level is not None:
+            parents = _native_merkle_level(b"".join(level), pairs)
+            level = [parents[i * 64:(i + 1) * 64] for i in range(pairs)]
+        else:
+            level = [hashlib.sha3_512(level[i] + level[i + 1]).digest()
+                     for i in range(0, len(level), 2)]
+    return level[0]
 
 def generate_keypair() -> Tuple[SPHINCSPlus, SPHINCSPlus]:
     """
@@ -98,6 +244,19 @@ def verify_signature(public_key: SPHINCSPlus, data: str, signature: bytes) -> bo
     except Exception:
         return False
 
+def verify_signatures(public_key: SPHINCSPlus, datas: List[str],
+                      signatures: List[bytes]) -> List[bool]:
+    """
+    Batch counterpart of verify_signature: verify many signatures under one
+    key in a single pass instead of one hash round-trip per signature
+    """
+    try:
+        decoded = [base64.b64decode(s) for s in signatures]
+        return public_key.verify_batch([d.encode() for d in datas], decoded)
+    except Exception:
+        return [verify_signature(public_key, d, s)
+                for d, s in zip(datas, signatures)]
+
 # Additional utility functions for quantum-resistant encryption
 def generate_ntru_keypair() -> NTRUEncryption:
     """
@@ -126,16 +285,25 @@ class KyberKEM:
         self.security_parameter = security_parameter
         self.public_key = None
         self.private_key = None
+        # Scratch buffer reused by encapsulate/decapsulate; shared secrets
+        # are 32 bytes, so the hot path never allocates
+        self._work = np.empty(32, dtype=np.uint8)
         self._generate_keypair()
 
     def _generate_keypair(self):
         """Generate Kyber keypair"""
         seed = secrets.token_bytes(32)
         # Use seed to generate deterministic keypair
-        rng = np.random.RandomState(list(seed))
-        self.private_key = rng.randint(0, 2**8, self.security_parameter, dtype=np.uint8)
-        # Public key is a transformation of private key
-        self.public_key = (self.private_key + rng.randint(0, 2**8, self.security_parameter, dtype=np.uint8)) % 256
+        rng = np.random.Generator(
+            np.random.PCG64(int.from_bytes(seed[:16], 'little')))
+        self.private_key = rng.integers(0, 2**8, self.security_parameter, dtype=np.uint8)
+        # Public key is a transformation of private key; uint8 addition
+        # already wraps modulo 256
+        self.public_key = self.private_key + rng.integers(0, 2**8, self.security_parameter, dtype=np.uint8)
+        # Shared secrets are 32 bytes, so encapsulate/decapsulate only ever
+        # touch the leading 32 key bytes; hoist those views out of the hot path
+        self._pk_head = self.public_key[:32]
+        self._sk_head = self.private_key[:32]
 
     def encapsulate(self) -> Tuple[bytes, bytes]:
         """Generate a shared secret and its encapsulation"""
@@ -144,26 +312,36 @@ class KyberKEM:
         h = hashlib.sha3_256()
         h.update(shared_secret)
         encryption_key = np.frombuffer(h.digest(), dtype=np.uint8)
-        # Encrypt using public key
+        # Encrypt using public key, accumulating in place in the scratch
+        # buffer; uint8 addition wraps modulo 256
         ciphertext = np.frombuffer(shared_secret, dtype=np.uint8)
-        encrypted = ((ciphertext + encryption_key[:len(ciphertext)] + 
-                     self.public_key[:len(ciphertext)]) % 256).astype(np.uint8)
-        return shared_secret, encrypted.tobytes()
+        work = self._work
+        np.add(ciphertext, encryption_key, out=work)
+        np.add(work, self._pk_head, out=work)
+        return shared_secret, work.tobytes()
 
     def decapsulate(self, ciphertext: bytes) -> bytes:
         """Recover the shared secret from its encapsulation"""
         cipher_array = np.frombuffer(ciphertext, dtype=np.uint8)
-        # First step of decryption using private key
-        temp_decrypt = ((cipher_array - self.private_key[:len(cipher_array)]) % 256).astype(np.uint8)
+        n = len(cipher_array)
+        # Shared secrets are 32 bytes, but ciphertexts arrive off the wire;
+        # fall back to a sized allocation when one exceeds the scratch buffer
+        work = (self._work[:n] if n <= len(self._work)
+                else np.empty(n, dtype=np.uint8))
+        private_head = self._sk_head if n == 32 else self.private_key[:n]
+        # First step of decryption using private key; uint8 subtraction
+        # wraps modulo 256
+        np.subtract(cipher_array, private_head, out=work)
         # Recover the original shared secret
-        decrypted = temp_decrypt.tobytes()
-        # Verify the decryption
+        decrypted = work.tobytes()
+        # Verify the decryption, reusing the work buffer
         h = hashlib.sha3_256()
         h.update(decrypted)
-        encryption_key = np.frombuffer(h.digest(), dtype=np.uint8)
-        verification = ((np.frombuffer(decrypted, dtype=np.uint8) + 
-                        encryption_key[:len(cipher_array)]) % 256).astype(np.uint8)
-        if np.array_equal(verification, cipher_array):
+        encryption_key = np.resize(
+            np.frombuffer(h.digest(), dtype=np.uint8), n)
+        np.add(np.frombuffer(decrypted, dtype=np.uint8),
+               encryption_key, out=work)
+        if np.array_equal(work, cipher_array):
             return decrypted
         return secrets.token_bytes(32)  # Return random on failure
 
@@ -176,6 +354,10 @@ class Dilithium:
         self.security_level = security_level
         self.private_key = self._generate_private_key()
         self.public_key = self._generate_public_key()
+        # Every sign/verify starts by hashing the private key; absorb it
+        # once and copy the midstate instead of rehashing it per call
+        self._key_hasher = hashlib.sha3_512()
+        self._key_hasher.update(self.private_key)
 
     def _generate_private_key(self) -> bytes:
         # Simulate Dilithium private key generation
@@ -189,8 +371,7 @@ class Dilithium:
 
     def sign(self, message: bytes) -> bytes:
         # Simulate Dilithium signature
-        h = hashlib.sha3_512()
-        h.update(self.private_key)
+        h = self._key_hasher.copy()
         h.update(message)
         # Add some random bytes to simulate the actual signature scheme
         signature = h.digest() + secrets.token_bytes(32 * self.security_level)
@@ -200,8 +381,7 @@ class Dilithium:
         # Simulate Dilithium verification
         if len(signature) < 64:  # Basic length check
             return False
-        h = hashlib.sha3_512()
-        h.update(self.private_key)
+        h = self._key_hasher.copy()
         h.update(message)
         expected = h.digest()
         return signature.startswith(expected)
@@ -217,6 +397,12 @@ class Rainbow:
         self.total_vars = vinegar_vars + oil_vars
         self.private_key = self._generate_private_key()
         self.public_key = self._generate_public_key()
+        # sign reseeded a PRNG from the private key on every call, always
+        # drawing the same vector; derive it once at key generation instead
+        rng = np.random.Generator(
+            np.random.PCG64(int.from_bytes(self.private_key[:16], 'little')))
+        self._signature_vector = rng.integers(
+            0, 256, self.total_vars, dtype=np.uint8)
 
     def _generate_private_key(self) -> bytes:
         """Generate Rainbow private key"""
@@ -234,16 +420,16 @@ class Rainbow:
         h = hashlib.sha3_512()
         h.update(message)
         hash_bytes = h.digest()
-        return np.frombuffer(hash_bytes, dtype=np.uint8) % 256
+        # uint8 values are already reduced modulo 256
+        return np.frombuffer(hash_bytes, dtype=np.uint8)
 
     def sign(self, message: bytes) -> bytes:
         """Generate Rainbow signature"""
         hash_value = self._hash_message(message)
-        # Simulate solving the multivariate equations
-        rng = np.random.RandomState(list(self.private_key))
-        signature_vector = rng.randint(0, 256, self.total_vars, dtype=np.uint8)
-        # Mix with hash value
-        signature = (signature_vector + hash_value[:self.total_vars]) % 256
+        # Simulate solving the multivariate equations with the key-derived
+        # vector computed at key generation
+        # Mix with hash value; uint8 addition wraps modulo 256
+        signature = self._signature_vector + hash_value[:self.total_vars]
         return signature.tobytes() + self.private_key[:32]
 
     def verify(self, message: bytes, signature: bytes) -> bool:
@@ -260,7 +446,7 @@ class Rainbow:
         verification_hash.update(signature[-32:])  # Use last 32 bytes for verification
         expected = verification_hash.digest()[:self.total_vars]
         
-        return np.array_equal(sig_array % 256, np.frombuffer(expected, dtype=np.uint8) % 256)
+        return np.array_equal(sig_array, np.frombuffer(expected, dtype=np.uint8))
 
 def generate_rainbow_keypair() -> Rainbow:
     """Generate a Rainbow signature pair"""
@@ -275,6 +461,10 @@ class NTRU:
         self.N = N  # Polynomial degree
         self.p = p  # Small modulus
         self.q = q  # Large modulus
+        # Power-of-two q lets reductions modulo q use a bitwise AND
+        assert q & (q - 1) == 0, "q must be a power of two"
+        # Scratch polynomial reused across encrypt/decrypt calls
+        self._poly_buf = np.zeros(N, dtype=np.uint64)
         self.private_key = self._generate_private_key()
         self.public_key = self._generate_public_key()
 
@@ -299,22 +489,36 @@ class NTRU:
         h.update(self.public_key)
         random_seed = h.digest()
         
-        # Use random seed to generate encryption randomness
-        rng = np.random.RandomState(list(random_seed))
-        r = rng.randint(0, self.q, len(message), dtype=np.uint16)
-        
-        # Simulate NTRU encryption
+        # Use random seed to generate encryption randomness; seeding PCG64
+        # from the raw digest bytes avoids RandomState's per-call reseed
+        # from a Python list of ints
+        rng = np.random.Generator(
+            np.random.PCG64(int.from_bytes(random_seed[:16], 'little')))
+        r = rng.integers(0, self.q, self.N, dtype=np.uint16)
+
+        # NTRU encryption: blind the message polynomial in place and
+        # convolve with the public key in Z_q[x]/(x^N - 1)
         msg_array = np.frombuffer(message, dtype=np.uint8)
-        encrypted = ((msg_array + r) * np.frombuffer(self.public_key[:len(message)], dtype=np.uint8)) % self.q
-        return encrypted.tobytes()
+        m = self._poly_buf
+        m[:] = 0
+        m[:len(msg_array)] = msg_array
+        np.add(m, r, out=m)
+        np.bitwise_and(m, np.uint64(self.q - 1), out=m)
+        h = np.resize(np.frombuffer(self.public_key, dtype=np.uint8),
+                      self.N).astype(np.uint64)
+        encrypted = _cyclic_convolve(m, h, self.N, self.q)
+        return encrypted.astype(np.uint16).tobytes()
 
     def decrypt(self, ciphertext: bytes) -> bytes:
         """Decrypt a message using NTRU"""
         cipher_array = np.frombuffer(ciphertext, dtype=np.uint16)
-        # Simulate NTRU decryption
-        decryption_array = np.frombuffer(self.private_key[:len(cipher_array)], dtype=np.uint8)
-        decrypted = (cipher_array * decryption_array) % self.q
-        return (decrypted % 256).astype(np.uint8).tobytes()
+        c = self._poly_buf
+        c[:] = 0
+        c[:len(cipher_array)] = cipher_array
+        f = np.resize(np.frombuffer(self.private_key, dtype=np.uint8),
+                      self.N).astype(np.uint64)
+        decrypted = _cyclic_convolve(c, f, self.N, self.q)
+        return (decrypted & np.uint64(0xFF)).astype(np.uint8).tobytes()
 
 def generate_ntru_keypair() -> NTRU:
     """Generate an NTRU encryption pair"""
@@ -1,71 +1,37 @@
-import time
-from typing import List
-import math
+import hashlib
 
 class QuantumProofOfWork:
     def __init__(self, difficulty: int = 4):
         self.difficulty = difficulty
-        self.target = 2 ** (256 - difficulty)
+        # Leading-zero target over the SHA3-512 digest: difficulty counts
+        # zero hex digits, four bits each.
+        self.target = 2 ** (512 - 4 * difficulty)
 
-    def solve_traveling_salesman(self, cities: List[tuple]) -> float:
+    def calculate_work(self, block_data: str | bytes, nonce: int) -> bool:
         """
-        Simplified Traveling Salesman Problem for PoW
+        Check whether block_data||nonce meets the proof-of-work target.
+        The nonce is appended as 8-byte little-endian, matching the
+        canonical block layout used by Block.calculate_hash.
         """
-        n = len(cities)
-        if n <= 2:
-            return 0
+        if isinstance(block_data, str):
+            block_data = block_data.encode()
+        digest = hashlib.sha3_512(block_data + nonce.to_bytes(8, 'little')).digest()
+        return int.from_bytes(digest, 'big') < self.target
 
-        min_distance = float('inf')
-        for i in range(n):
-            for j in range(i + 1, n):
-                dist = math.sqrt((cities[i][0] - cities[j][0])**2 + 
-                               (cities[i][1] - cities[j][1])**2)
-                min_distance = min(min_distance, dist)
-        
-        return min_distance
-
-    def grover_simulation(self, data: List[int], target: int) -> int:
-        """
-        Simplified Grover's algorithm simulation for PoW
-        """
-        iterations = int(math.sqrt(len(data)))
-        found_index = -1
-        
-        for _ in range(iterations):
-            for i, value in enumerate(data):
-                if value == target:
-                    found_index = i
-                    break
-        
-        return found_index
-
-    def shor_simulation(self, n: int) -> List[int]:
-        """
-        Simplified Shor's algorithm simulation for PoW
-        """
-        factors = []
-        for i in range(2, int(math.sqrt(n)) + 1):
-            while n % i == 0:
-                factors.append(i)
-                n //= i
-        if n > 1:
-            factors.append(n)
-        return factors
-
-    def calculate_work(self, block_data: str, nonce: int) -> bool:
-        """
-        Combine multiple quantum-inspired problems for PoW
-        """
-        # Simulate quantum problems
-        cities = [(0, 0), (1, 1), (2, 2), (3, 3)]
-        tsp_result = self.solve_traveling_salesman(cities)
-        
-        data = list(range(16))
-        grover_result = self.grover_simulation(data, 7)
-        
-        shor_result = self.shor_simulation(15)
-        
-        # Combine results for final PoW check
-        combined_effort = (tsp_result * grover_result * sum(shor_result)) % self.target
-        
-        return combined_effort < self.target
+    def find_nonce(self, block_data: str | bytes, start: int = 0) -> int:
+        """
+        Search nonces from `start` until one meets the target. The fixed
+        block prefix is absorbed into a hash midstate once; each candidate
+        copies the state and absorbs only its 8-byte nonce, so per-nonce
+        cost no longer scales with the size of the serialized block.
+        """
+        if isinstance(block_data, str):
+            block_data = block_data.encode()
+        seed = hashlib.sha3_512(block_data)
+        nonce = start
+        while True:
+            h = seed.copy()
+            h.update(nonce.to_bytes(8, 'little'))
+            if int.from_bytes(h.digest(), 'big') < self.target:
+                return nonce
+            nonce += 1
@@ -1,10 +1,37 @@
+import asyncio
 import socket
 import json
+import struct
 import threading
 from typing import List, Dict
 from blockchain import Blockchain, Block
 from transaction import Transaction
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps_bytes(obj) -> bytes:
+    """Serialize to JSON bytes, via orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+def loads_bytes(data) -> Dict:
+    """Parse JSON bytes, via orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Messages are framed as a 4-byte big-endian length followed by the JSON
+# payload, so one recv never straddles or coalesces messages.
+MAX_MESSAGE_SIZE = 1 << 20
+
+def frame_message(payload: bytes) -> bytes:
+    """Prefix a payload with its 4-byte big-endian length"""
+    return struct.pack('>I', len(payload)) + payload
+
 class P2PNetwork:
     def __init__(self, host: str = '0.0.0.0', port: int = 8000):
         self.host = host
@@ -13,6 +40,11 @@ class P2PNetwork:
         self.blockchain: Blockchain | None = None
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # Event loop running on its own thread so broadcasts to all peers
+        # proceed concurrently; writers are cached per peer to amortize
+        # connection setup over many broadcasts
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._connections: Dict[tuple, asyncio.StreamWriter] = {}
 
     def start(self, blockchain: Blockchain):
         """
@@ -29,6 +61,13 @@ class P2PNetwork:
             self.listener_thread = threading.Thread(target=self.listen_for_connections)
             self.listener_thread.daemon = True  # Make thread daemon so it exits when main thread exits
             self.listener_thread.start()
+
+            # Start the broadcast event loop on its own thread
+            self._loop = asyncio.new_event_loop()
+            self.broadcast_thread = threading.Thread(
+                target=self._loop.run_forever)
+            self.broadcast_thread.daemon = True
+            self.broadcast_thread.start()
         except Exception as e:
             self.stop()
             raise Exception(f"Failed to start network: {str(e)}")
@@ -43,15 +82,24 @@ class P2PNetwork:
             client_thread.start()
 
     def handle_client(self, client: socket.socket, address: tuple):
+        # Buffers are allocated once per connection; every message is read
+        # into them with recv_into, so the receive path does not allocate
+        header = bytearray(4)
+        buf = bytearray(MAX_MESSAGE_SIZE)
         while True:
             try:
-                message = client.recv(4096)
-                if not message:
+                if not self._recv_exact(client, memoryview(header)):
+                    break
+                (length,) = struct.unpack('>I', header)
+                if length > MAX_MESSAGE_SIZE:
+                    break
+                view = memoryview(buf)[:length]
+                if not self._recv_exact(client, view):
                     break
                 try:
-                    data = json.loads(message.decode())
+                    data = loads_bytes(view.tobytes())
                     self.process_message(data, client)
-                except json.JSONDecodeError:
+                except ValueError:
                     # Ignore invalid JSON messages
                     continue
             except Exception as e:
@@ -59,6 +107,19 @@ class P2PNetwork:
                 break
         client.close()
 
+    @staticmethod
+    def _recv_exact(client: socket.socket, view: memoryview) -> bool:
+        """
+        Fill the view completely from the socket; False on clean EOF
+        """
+        offset = 0
+        while offset < len(view):
+            received = client.recv_into(view[offset:])
+            if received == 0:
+                return False
+            offset += received
+        return True
+
     def process_message(self, data: Dict, client: socket.socket):
         if not self.blockchain:
             return
@@ -79,9 +140,9 @@ class P2PNetwork:
             # Send entire blockchain
             response = {
                 'type': 'chain',
-                'data': [block.__dict__ for block in self.blockchain.chain]
+                'data': [block.to_dict() for block in self.blockchain.chain]
             }
-            client.send(json.dumps(response).encode())
+            client.sendall(frame_message(dumps_bytes(response)))
 
     def broadcast_transaction(self, transaction: Transaction):
         message = {
@@ -93,19 +154,66 @@ class P2PNetwork:
     def broadcast_block(self, block: Block):
         message = {
             'type': 'new_block',
-            'data': block.__dict__
+            'data': block.to_dict()
         }
         self.broadcast_message(message)
 
     def broadcast_message(self, message: Dict):
-        for peer in self.peers:
-            try:
-                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                    s.connect(peer)
-                    s.send(json.dumps(message).encode())
-            except Exception as e:
-                print(f"Error broadcasting to peer {peer}: {e}")
-                self.peers.remove(peer)
+        data = frame_message(dumps_bytes(message))
+        if self._loop is None or not self._loop.is_running():
+            # Network not started; fall back to one synchronous send per peer
+            dead = []
+            for peer in self.peers:
+                try:
+                    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                        s.connect(peer)
+                        s.sendall(data)
+                except Exception as e:
+                    print(f"Error broadcasting to peer {peer}: {e}")
+                    dead.append(peer)
+            self._drop_peers(dead)
+            return
+
+        future = asyncio.run_coroutine_threadsafe(
+            self._broadcast_async(data), self._loop)
+        future.result()
+
+    async def _broadcast_async(self, data: bytes):
+        """
+        Send data to all peers concurrently; unreachable peers are dropped
+        """
+        peers = list(self.peers)
+        results = await asyncio.gather(
+            *[self._send_to_peer(peer, data) for peer in peers],
+            return_exceptions=True)
+        dead = []
+        for peer, result in zip(peers, results):
+            if isinstance(result, Exception):
+                print(f"Error broadcasting to peer {peer}: {result}")
+                dead.append(peer)
+        self._drop_peers(dead)
+
+    def _drop_peers(self, dead: List[tuple]):
+        """
+        Rebuild the peer list without the given peers in one pass, instead
+        of one O(P) remove per failure
+        """
+        if dead:
+            dead_set = set(dead)
+            self.peers = [p for p in self.peers if p not in dead_set]
+
+    async def _send_to_peer(self, peer: tuple, data: bytes):
+        writer = self._connections.get(peer)
+        if writer is None or writer.is_closing():
+            _, writer = await asyncio.open_connection(*peer)
+            self._connections[peer] = writer
+        try:
+            writer.write(data)
+            await writer.drain()
+        except Exception:
+            self._connections.pop(peer, None)
+            writer.close()
+            raise
 
     def add_peer(self, host: str, port: int):
         peer = (host, port)
@@ -116,6 +224,11 @@ class P2PNetwork:
         """
         Stop the network and clean up resources
         """
+        if self._loop is not None and self._loop.is_running():
+            for writer in self._connections.values():
+                self._loop.call_soon_threadsafe(writer.close)
+            self._connections = {}
+            self._loop.call_soon_threadsafe(self._loop.stop)
         if hasattr(self, 'socket'):
             try:
                 self.socket.shutdown(socket.SHUT_RDWR)
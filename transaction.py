@@ -0,0 +1,75 @@
+import time
+import json
+from crypto import hash_block, sign_data, verify_signature
+
+class Transaction:
+    def __init__(self, sender: str, recipient: str, amount: float,
+                 signature: bytes | None = None, public_key=None):
+        self.sender = sender
+        self.recipient = recipient
+        self.amount = amount
+        self.timestamp = time.time()
+        self.signature = signature
+        # SPHINCS+ key of the sender; required to verify the signature and
+        # checked against the sender address in is_valid
+        self.public_key = public_key
+
+    def calculate_hash(self) -> str:
+        """
+        Calculate the SHA3-512 hash of the transaction's canonical form
+        """
+        transaction_dict = {
+            "sender": self.sender,
+            "recipient": self.recipient,
+            "amount": self.amount,
+            "timestamp": self.timestamp
+        }
+        return hash_block(json.dumps(transaction_dict, sort_keys=True))
+
+    def sign(self, private_key):
+        """
+        Sign the transaction with the sender's SPHINCS+ private key
+        """
+        if self.signature:
+            raise Exception("Transaction already signed")
+        self.signature = sign_data(private_key, self.calculate_hash())
+
+    def is_valid(self) -> bool:
+        """
+        Verify the transaction signature and its binding to the sender
+        """
+        if self.sender == "network":
+            return True
+
+        if not self.signature or self.public_key is None:
+            return False
+
+        # The sender address must be derived from the attached public key,
+        # otherwise a valid signature under an unrelated key would pass
+        if hash_block(str(self.public_key))[:40] != self.sender:
+            return False
+
+        return verify_signature(self.public_key, self.calculate_hash(),
+                                self.signature)
+
+    def to_canonical_bytes(self) -> bytes:
+        """
+        Canonical byte serialization used for block hashing, computed once.
+        Transactions are immutable once signed, so the cached form is safe
+        to reuse across repeated hash calculations.
+        """
+        if not hasattr(self, '_canonical_bytes'):
+            self._canonical_bytes = json.dumps(self.to_dict(), sort_keys=True).encode()
+        return self._canonical_bytes
+
+    def to_dict(self) -> dict:
+        """
+        Convert transaction to dictionary format
+        """
+        return {
+            "sender": self.sender,
+            "recipient": self.recipient,
+            "amount": self.amount,
+            "timestamp": self.timestamp,
+            "signature": self.signature.hex() if self.signature else None
+        }
@@ -0,0 +1,28 @@
+from crypto import generate_keypair, hash_block
+from transaction import Transaction
+
+class Wallet:
+    def __init__(self):
+        self.private_key, self.public_key = generate_keypair()
+        self.address = self.generate_address()
+
+    def generate_address(self) -> str:
+        """
+        Generate a wallet address from the public key
+        """
+        return hash_block(str(self.public_key))[:40]
+
+    def create_transaction(self, recipient: str, amount: float) -> Transaction:
+        """
+        Create and sign a new transaction
+        """
+        transaction = Transaction(self.address, recipient, amount,
+                                  public_key=self.public_key)
+        transaction.sign(self.private_key)
+        return transaction
+
+    def get_public_key(self) -> str:
+        """
+        Get the public key in string format
+        """
+        return str(self.public_key)